@@ -1,8 +1,40 @@
 """Configuration management for LocalFlow."""
+import copy
 import json
 import os
+import threading
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
+
+# Decoding options forwarded to mlx_whisper.transcribe. A single temperature
+# disables the fallback re-decodes.
+DEFAULT_DECODE_OPTIONS: Dict[str, Any] = {
+    "temperature": 0.0
+}
+# Canonical hotkey modifier order; unknown modifiers sort last
+MODIFIER_ORDER: Dict[str, int] = {"cmd": 0, "ctrl": 1, "alt": 2, "shift": 3}
+
+
+def canonical_modifiers(modifiers: List[str]) -> List[str]:
+    """Return hotkey modifiers deduplicated and in MODIFIER_ORDER.
+    
+    Keeps the stored config byte-stable for the same hotkey regardless of
+    the order the modifiers were pressed in.
+    """
+    return sorted(set(modifiers), key=lambda m: (MODIFIER_ORDER.get(m, len(MODIFIER_ORDER)), m))
+
+
+# Last parsed config.json, keyed on (st_mtime_ns, st_size) so repeated loads
+# skip the disk read and JSON parse until the file actually changes
+_cache_lock = threading.Lock()
+_cached_stat: Optional[Tuple[int, int]] = None
+_cached_config: Optional[Dict[str, Any]] = None
+
+
+def _stat_key(config_path: Path) -> Tuple[int, int]:
+    """Return the (mtime_ns, size) pair used to detect config file changes."""
+    st = config_path.stat()
+    return st.st_mtime_ns, st.st_size
 
 
 def get_config_path() -> Path:
@@ -14,7 +46,12 @@ def get_config_path() -> Path:
 
 
 def load_config() -> Dict[str, Any]:
-    """Load configuration from config.json."""
+    """Load configuration from config.json.
+    
+    The parsed file is cached and only re-read when its mtime or size changes.
+    Callers get their own copy and may mutate it freely.
+    """
+    global _cached_stat, _cached_config
     config_path = get_config_path()
     
     if not config_path.exists():
@@ -25,6 +62,7 @@ def load_config() -> Dict[str, Any]:
             "mode": "toggle",
             "cache_dir": "~/.cache/local_whisper",
             "vad_enabled": True,
+            "decode_options": dict(DEFAULT_DECODE_OPTIONS),
             "audio": {
                 "microphone_device": None,
                 "system_audio_device": None,
@@ -34,9 +72,13 @@ def load_config() -> Dict[str, Any]:
         }
     
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-        return config
+        with _cache_lock:
+            stat_key = _stat_key(config_path)
+            if stat_key != _cached_stat:
+                with open(config_path, 'r', encoding='utf-8') as f:
+                    _cached_config = json.load(f)
+                _cached_stat = stat_key
+            return copy.deepcopy(_cached_config)
     except (json.JSONDecodeError, IOError) as e:
         # If there's an error reading, return default config
         print(f"Error loading config: {e}. Using defaults.")
@@ -46,6 +88,7 @@ def load_config() -> Dict[str, Any]:
             "mode": "toggle",
             "cache_dir": "~/.cache/local_whisper",
             "vad_enabled": True,
+            "decode_options": dict(DEFAULT_DECODE_OPTIONS),
             "audio": {
                 "microphone_device": None,
                 "system_audio_device": None,
@@ -57,15 +100,21 @@ def load_config() -> Dict[str, Any]:
 
 def save_config(config: Dict[str, Any]) -> bool:
     """Save configuration to config.json."""
+    global _cached_stat, _cached_config
     config_path = get_config_path()
     
     try:
         # Ensure directory exists
         config_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Write config with pretty formatting
-        with open(config_path, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=2, ensure_ascii=False)
+        # Serialize with pretty formatting
+        text = json.dumps(config, indent=2, ensure_ascii=False)
+        with _cache_lock:
+            with open(config_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            # Seed the cache with exactly what load_config would parse from the file
+            _cached_config = json.loads(text)
+            _cached_stat = _stat_key(config_path)
         return True
     except IOError as e:
         print(f"Error saving config: {e}")
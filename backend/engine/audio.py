@@ -16,6 +16,7 @@ class AudioRecorder:
     SAMPLE_RATE = 16000  # Whisper standard
     CHANNELS = 1  # Mono
     BUFFER_SIZE = 1024  # Samples per buffer for responsive visualization
+    INITIAL_CAPACITY_SEC = 60  # Preallocated recording length; grows by doubling
     
     def __init__(self):
         """Initialize audio recorder."""
@@ -23,16 +24,80 @@ class AudioRecorder:
         self.stream: Optional[sd.InputStream] = None
         self.mic_stream: Optional[sd.InputStream] = None
         self.system_stream: Optional[sd.InputStream] = None
-        self.audio_buffer: deque = deque()  # Unbounded buffer to preserve all audio
-        self.mic_buffer: deque = deque()  # Buffer for microphone audio
-        self.system_buffer: deque = deque()  # Buffer for system audio
+        # Recorded audio, preallocated per recording; _write_pos samples are valid
+        self._audio_data: np.ndarray = np.empty(0, dtype=np.float32)
+        self._write_pos = 0
+        self.mic_buffer: deque = deque()  # Pending microphone audio blocks (np.ndarray)
+        self.system_buffer: deque = deque()  # Pending system audio blocks (np.ndarray)
         self.waveform_buffer: deque = deque(maxlen=200)  # Store waveform points for visualization
+        # Immutable copy of waveform_buffer, replaced on every append so readers
+        # (e.g. the server's event loop) never wait on the audio lock
+        self._waveform_snapshot: List[float] = []
+        # Bumped whenever a new snapshot is published; lets pollers skip unchanged frames
+        self.waveform_generation = 0
         self.is_recording = False
         self.waveform_callback: Optional[Callable[[float], None]] = None
         self._lock = threading.Lock()
         self._mix_audio = True
         logger.info("AudioRecorder initialized successfully")
     
+    def _append_audio(self, samples: np.ndarray):
+        """Append samples to the recording buffer. Caller must hold self._lock.
+        
+        Args:
+            samples: Mono float32 samples to append
+        """
+        end = self._write_pos + len(samples)
+        if end > len(self._audio_data):
+            # Out of preallocated space: grow by doubling to keep appends amortized O(1)
+            grown = np.empty(max(end, 2 * len(self._audio_data)), dtype=np.float32)
+            grown[:self._write_pos] = self._audio_data[:self._write_pos]
+            self._audio_data = grown
+        self._audio_data[self._write_pos:end] = samples
+        self._write_pos = end
+    
+    @staticmethod
+    def _pending_samples(blocks: deque) -> int:
+        """Count samples queued in a deque of audio blocks."""
+        return sum(block.size for block in blocks)
+    
+    @staticmethod
+    def _take_samples(blocks: deque, count: int) -> np.ndarray:
+        """Pop exactly `count` samples from a deque of audio blocks. Caller must hold self._lock.
+        
+        Whole blocks are moved with one concatenate; a partially consumed block
+        has its remainder pushed back to the front of the deque.
+        
+        Args:
+            blocks: Deque of 1-D float32 sample blocks
+            count: Number of samples to take (must not exceed the pending total)
+            
+        Returns:
+            Array of `count` samples
+        """
+        taken = []
+        needed = count
+        while needed > 0:
+            block = blocks.popleft()
+            if block.size > needed:
+                blocks.appendleft(block[needed:])
+                block = block[:needed]
+            taken.append(block)
+            needed -= block.size
+        if len(taken) == 1:
+            return taken[0]
+        return np.concatenate(taken) if taken else np.empty(0, dtype=np.float32)
+    
+    def _push_amplitude(self, amplitude: float):
+        """Record a waveform amplitude and publish a new snapshot. Caller must hold self._lock.
+        
+        Args:
+            amplitude: Mean absolute amplitude of the latest audio block
+        """
+        self.waveform_buffer.append(amplitude)
+        self._waveform_snapshot = list(self.waveform_buffer)
+        self.waveform_generation += 1
+    
     @staticmethod
     def list_audio_devices() -> List[Dict]:
         """List all available audio input devices.
@@ -122,10 +187,14 @@ class AudioRecorder:
         logger.info("Step 1: Starting audio recording")
         self.waveform_callback = waveform_callback
         self._mix_audio = mix_audio
-        self.audio_buffer.clear()
+        # Fresh buffer per recording: the previous one may still be referenced by
+        # the array returned from stop_recording()
+        self._audio_data = np.empty(self.INITIAL_CAPACITY_SEC * self.SAMPLE_RATE * self.CHANNELS, dtype=np.float32)
+        self._write_pos = 0
         self.mic_buffer.clear()
         self.system_buffer.clear()
         self.waveform_buffer.clear()
+        self._waveform_snapshot = []
         logger.debug("Step 2: Audio buffers cleared")
         
         # Determine which devices to use
@@ -169,18 +238,19 @@ class AudioRecorder:
                     audio_data = indata.flatten()
                 
                 # If mixing with system audio, store in mic_buffer for mixing thread
-                # Otherwise, add directly to audio_buffer to avoid duplication
+                # Otherwise, add directly to the recording buffer to avoid duplication
                 if use_system and self._mix_audio:
-                    self.mic_buffer.extend(audio_data)
+                    self.mic_buffer.append(audio_data)
                 else:
-                    # Not mixing - add directly to audio_buffer
-                    self.audio_buffer.extend(audio_data)
-                    amplitude = np.abs(audio_data).mean()
-                    self.waveform_buffer.append(amplitude)
+                    # Not mixing - add directly to the recording buffer
+                    self._append_audio(audio_data)
+                    # Store as a Python float so waveform data is JSON-ready without per-item conversion
+                    amplitude = float(np.abs(audio_data).mean())
+                    self._push_amplitude(amplitude)
                     
                     if self.waveform_callback:
                         try:
-                            self.waveform_callback(float(amplitude))
+                            self.waveform_callback(amplitude)
                         except Exception as e:
                             logger.error(f"Error in waveform callback: {e}", exc_info=True)
         
@@ -197,7 +267,7 @@ class AudioRecorder:
                     audio_data = indata.flatten()
                 
                 # Store system audio
-                self.system_buffer.extend(audio_data)
+                self.system_buffer.append(audio_data)
         
         def mix_audio_thread():
             """Thread to mix microphone and system audio streams."""
@@ -206,29 +276,30 @@ class AudioRecorder:
                 mixed_any = False
                 with self._lock:
                     # Get minimum length of both buffers (mix in chunks of BUFFER_SIZE for efficiency)
-                    if len(self.mic_buffer) >= self.BUFFER_SIZE and len(self.system_buffer) >= self.BUFFER_SIZE:
+                    if (self._pending_samples(self.mic_buffer) >= self.BUFFER_SIZE
+                            and self._pending_samples(self.system_buffer) >= self.BUFFER_SIZE):
                         chunk_size = self.BUFFER_SIZE
                         
                         # Extract and mix audio
-                        mic_chunk = np.array([self.mic_buffer.popleft() for _ in range(chunk_size)], dtype=np.float32)
-                        system_chunk = np.array([self.system_buffer.popleft() for _ in range(chunk_size)], dtype=np.float32)
+                        mic_chunk = self._take_samples(self.mic_buffer, chunk_size)
+                        system_chunk = self._take_samples(self.system_buffer, chunk_size)
                         
                         # Mix audio (simple addition, can be normalized if needed)
                         mixed = mic_chunk + system_chunk
                         
                         # Store mixed audio
-                        self.audio_buffer.extend(mixed)
+                        self._append_audio(mixed)
                         
                         # Calculate amplitude for waveform visualization
-                        amplitude = np.abs(mixed).mean()
-                        self.waveform_buffer.append(amplitude)
+                        amplitude = float(np.abs(mixed).mean())
+                        self._push_amplitude(amplitude)
                         
                         mixed_any = True
                         
                         # Call waveform callback if provided
                         if self.waveform_callback:
                             try:
-                                self.waveform_callback(float(amplitude))
+                                self.waveform_callback(amplitude)
                             except Exception as e:
                                 logger.error(f"Error in waveform callback: {e}", exc_info=True)
                 
@@ -348,30 +419,32 @@ class AudioRecorder:
         # Final mix of any remaining audio in buffers
         with self._lock:
             # If we were mixing and have remaining buffers, mix them now
-            if self._mix_audio and len(self.mic_buffer) > 0 and len(self.system_buffer) > 0:
-                min_len = min(len(self.mic_buffer), len(self.system_buffer))
-                mic_remaining = np.array([self.mic_buffer.popleft() for _ in range(min_len)], dtype=np.float32)
-                system_remaining = np.array([self.system_buffer.popleft() for _ in range(min_len)], dtype=np.float32)
+            if self._mix_audio and self.mic_buffer and self.system_buffer:
+                min_len = min(self._pending_samples(self.mic_buffer), self._pending_samples(self.system_buffer))
+                mic_remaining = self._take_samples(self.mic_buffer, min_len)
+                system_remaining = self._take_samples(self.system_buffer, min_len)
                 mixed_remaining = mic_remaining + system_remaining
-                self.audio_buffer.extend(mixed_remaining)
+                self._append_audio(mixed_remaining)
             
             # Add any remaining microphone-only audio (only if we were mixing)
-            # If we weren't mixing, mic_buffer should be empty (audio went directly to audio_buffer)
-            if self._mix_audio and len(self.mic_buffer) > 0:
-                mic_remaining = np.array(list(self.mic_buffer), dtype=np.float32)
-                self.audio_buffer.extend(mic_remaining)
+            # If we weren't mixing, mic_buffer should be empty (audio went directly to the recording buffer)
+            if self._mix_audio and self.mic_buffer:
+                self._append_audio(np.concatenate(self.mic_buffer))
             
             # Clear all buffers
             self.mic_buffer.clear()
             self.system_buffer.clear()
             
-            # Convert buffer to numpy array
-            audio_data = np.array(list(self.audio_buffer), dtype=np.float32)
-            buffer_length = len(audio_data)
-            self.audio_buffer.clear()
+            # Hand out a view of the recorded samples (no copy); the next
+            # recording allocates its own buffer
+            audio_data = self._audio_data[:self._write_pos]
+            buffer_length = audio_data.size
+            self._audio_data = np.empty(0, dtype=np.float32)
+            self._write_pos = 0
             self.mic_buffer.clear()
             self.system_buffer.clear()
             self.waveform_buffer.clear()
+            self._waveform_snapshot = []
         
         logger.info(f"Step 5: Audio recording stopped. Captured {buffer_length} samples ({buffer_length / self.SAMPLE_RATE:.2f} seconds)")
         return audio_data
@@ -379,11 +452,12 @@ class AudioRecorder:
     def get_waveform_data(self) -> list[float]:
         """Get current waveform amplitude data for visualization.
         
+        Lock-free: returns the latest published snapshot, which callers must not modify.
+        
         Returns:
             List of amplitude values for oscilloscope visualization
         """
-        with self._lock:
-            return list(self.waveform_buffer)
+        return self._waveform_snapshot
     
     def get_current_amplitude(self) -> float:
         """Get the most recent amplitude value.
@@ -391,10 +465,10 @@ class AudioRecorder:
         Returns:
             Current amplitude (0.0 if no data)
         """
-        with self._lock:
-            if self.waveform_buffer:
-                return float(self.waveform_buffer[-1])
-            return 0.0
+        snapshot = self._waveform_snapshot
+        if snapshot:
+            return snapshot[-1]
+        return 0.0
     
     def is_active(self) -> bool:
         """Check if recording is active.
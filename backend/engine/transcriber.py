@@ -1,13 +1,23 @@
 """MLX-Whisper transcription engine for LocalFlow."""
+import hashlib
+import importlib.metadata
 import logging
 import os
+import platform
+import re
+import shutil
 import threading
+import time
+from concurrent.futures import Future
 from pathlib import Path
 from typing import Callable, Optional
 
+import mlx.core as mx
 import mlx_whisper
 import numpy as np
 from huggingface_hub import snapshot_download
+from huggingface_hub.utils import tqdm as hf_tqdm
+from mlx.utils import tree_flatten
 from mlx_whisper.load_models import load_model
 
 logger = logging.getLogger(__name__)
@@ -25,6 +35,11 @@ class WhisperTranscriber:
         "large": "mlx-community/whisper-large-v3",
         "large-turbo": "mlx-community/whisper-large-v3-turbo"
     }
+    # Reverse lookup from repo id to variant name
+    REPO_TO_VARIANT = {repo_id: variant for variant, repo_id in MODEL_VARIANTS.items()}
+    # Entry names from the old flat compiled/<key> cache layout
+    _LEGACY_COMPILED_KEY = re.compile(r"[0-9a-f]{32}(\.tmp)?")
+    MODELS_SCAN_TTL = 2.0  # Seconds a model cache directory scan is reused
     
     def __init__(self, cache_dir: Optional[str] = None):
         """Initialize transcriber.
@@ -37,29 +52,84 @@ class WhisperTranscriber:
         logger.debug(f"Cache directory: {self.cache_dir}")
         self.current_model: Optional[str] = None
         self.model = None
+        self._model_path: Optional[Path] = None  # Local directory the current model was loaded from
+        # Per-variant status rows reused across get_available_models() calls
+        self._models_info: dict[str, dict] = {}
+        self._models_scanned_at: Optional[float] = None  # time.monotonic() of the last disk scan
         self._lock = threading.Lock()
         logger.info("WhisperTranscriber initialized successfully")
         
     def get_available_models(self) -> dict[str, dict]:
         """Get list of available models and their status.
         
+        The download status is re-read from disk at most every MODELS_SCAN_TTL
+        seconds (or right after a download); the active flag is always current.
+        
         Returns:
             Dictionary mapping model names to their info (downloaded, path, size)
         """
-        models_info = {}
+        now = time.monotonic()
+        if self._models_scanned_at is not None and now - self._models_scanned_at < self.MODELS_SCAN_TTL:
+            for variant, info in self._models_info.items():
+                info["active"] = variant == self.current_model
+            return {variant: dict(info) for variant, info in self._models_info.items()}
+        self._models_scanned_at = now
         
         for variant, repo_id in self.MODEL_VARIANTS.items():
             model_path = Path(self.cache_dir) / repo_id.replace("/", "_")
-            is_downloaded = model_path.exists() and any(model_path.iterdir())
+            info = self._models_info.get(variant)
+            if info is None:
+                info = {"repo_id": repo_id, "downloaded": False, "path": None, "active": False}
+                self._models_info[variant] = info
+            
+            # A model seen as downloaded only needs a cheap existence check;
+            # the directory listing is reserved for models still missing
+            if info["downloaded"]:
+                is_downloaded = model_path.exists()
+            else:
+                is_downloaded = model_path.exists() and any(model_path.iterdir())
             
-            models_info[variant] = {
-                "repo_id": repo_id,
-                "downloaded": is_downloaded,
-                "path": str(model_path) if is_downloaded else None,
-                "active": variant == self.current_model
-            }
-        
-        return models_info
+            if is_downloaded != info["downloaded"]:
+                info["downloaded"] = is_downloaded
+                info["path"] = str(model_path) if is_downloaded else None
+            info["active"] = variant == self.current_model
+        
+        return {variant: dict(info) for variant, info in self._models_info.items()}
+    
+    @staticmethod
+    def _progress_tqdm_class(progress_callback: Callable[[float], None]) -> type:
+        """Build a tqdm class that forwards snapshot_download byte progress.
+        
+        snapshot_download drives one aggregated bar in bytes (unit "B") whose total
+        grows as files are discovered; the per-file count bar is ignored. Progress is
+        mapped onto 0.1-0.99 so the start (0.1) and completion (1.0) updates stay distinct.
+        
+        Args:
+            progress_callback: Callback receiving progress from 0.0 to 1.0
+            
+        Returns:
+            tqdm subclass suitable for snapshot_download's tqdm_class argument
+        """
+        class _ProgressTqdm(hf_tqdm):
+            def __init__(self, *args, **kwargs):
+                self._reports_bytes = kwargs.get("unit") == "B"
+                self._bytes_done = 0
+                self._reported = 0.1
+                super().__init__(*args, **kwargs)
+            
+            def update(self, n=1):
+                # Count bytes ourselves: a disabled tqdm doesn't advance self.n
+                result = super().update(n)
+                if self._reports_bytes and n and self.total:
+                    self._bytes_done += n
+                    progress = min(0.1 + 0.9 * self._bytes_done / self.total, 0.99)
+                    # The total grows per file, so never report a step backwards
+                    if progress > self._reported:
+                        self._reported = progress
+                        progress_callback(progress)
+                return result
+        
+        return _ProgressTqdm
     
     def download_model(self, model_name: str, progress_callback: Optional[Callable[[float], None]] = None) -> bool:
         """Download model from Hugging Face.
@@ -84,8 +154,7 @@ class WhisperTranscriber:
             os.makedirs(self.cache_dir, exist_ok=True)
             logger.debug(f"Cache directory ready: {self.cache_dir}")
             
-            # Download from Hugging Face
-            # Note: snapshot_download doesn't have built-in progress, but we can simulate it
+            # Download from Hugging Face, forwarding byte progress through a tqdm class
             if progress_callback:
                 progress_callback(0.1)
             
@@ -93,9 +162,13 @@ class WhisperTranscriber:
             model_path = snapshot_download(
                 repo_id=repo_id,
                 cache_dir=self.cache_dir,
-                local_dir=Path(self.cache_dir) / repo_id.replace("/", "_")
+                local_dir=Path(self.cache_dir) / repo_id.replace("/", "_"),
+                tqdm_class=self._progress_tqdm_class(progress_callback) if progress_callback else None
             )
             
+            # Force the next get_available_models() to rescan the cache directory
+            self._models_scanned_at = None
+            
             if progress_callback:
                 progress_callback(1.0)
             
@@ -108,6 +181,75 @@ class WhisperTranscriber:
                 progress_callback(-1.0)  # Signal error
             return False
     
+    def _compiled_cache_path(self, model_name: str) -> Path:
+        """Get the compiled-model cache directory for a model variant.
+        
+        Laid out as compiled/<repo>/<key>, where the key hashes the MLX version
+        and machine architecture so an MLX upgrade or a different machine never
+        reuses stale weights, and older keys for the repo can be pruned.
+        
+        Args:
+            model_name: Model variant name (tiny, base, small, medium, large, large-turbo)
+            
+        Returns:
+            Path to the compiled cache directory (may not exist yet)
+        """
+        repo_id = self.MODEL_VARIANTS[model_name]
+        try:
+            mlx_version = importlib.metadata.version("mlx")
+        except importlib.metadata.PackageNotFoundError:
+            mlx_version = "unknown"
+        key_source = f"{mlx_version}|{platform.machine()}"
+        cache_key = hashlib.blake2b(key_source.encode(), digest_size=16).hexdigest()
+        return Path(self.cache_dir) / "compiled" / repo_id.replace("/", "_") / cache_key
+    
+    def _prune_compiled_cache(self, keep: Optional[Path], repo_dir: Path):
+        """Delete compiled caches for a repo other than `keep`.
+        
+        Also removes entries from the old flat compiled/<key> layout, which
+        can't be attributed to a repo or MLX version.
+        
+        Args:
+            keep: Compiled cache directory to keep, or None to drop the repo's caches
+            repo_dir: compiled/<repo> directory to prune
+        """
+        try:
+            stale = [p for p in repo_dir.iterdir() if p != keep] if repo_dir.is_dir() else []
+            compiled_root = repo_dir.parent
+            if compiled_root.is_dir():
+                stale += [p for p in compiled_root.iterdir() if self._LEGACY_COMPILED_KEY.fullmatch(p.name)]
+            for path in stale:
+                logger.info(f"Removing stale compiled model cache {path}")
+                shutil.rmtree(path, ignore_errors=True)
+            if keep is None and repo_dir.is_dir() and not any(repo_dir.iterdir()):
+                repo_dir.rmdir()
+        except OSError as e:
+            logger.warning(f"Failed to prune compiled model cache (non-fatal): {e}")
+    
+    def _write_compiled_cache(self, model, model_path: Path, compiled_path: Path):
+        """Persist the loaded model as safetensors so later launches can mmap it.
+        
+        Args:
+            model: Loaded model whose parameters are written
+            model_path: Directory the model was loaded from (provides config.json)
+            compiled_path: Target compiled cache directory
+        """
+        tmp_path = compiled_path.with_name(compiled_path.name + ".tmp")
+        try:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            tmp_path.mkdir(parents=True)
+            shutil.copyfile(model_path / "config.json", tmp_path / "config.json")
+            weights = dict(tree_flatten(model.parameters()))
+            mx.save_safetensors(str(tmp_path / "weights.safetensors"), weights)
+            # Rename last so a partially written cache is never picked up
+            shutil.rmtree(compiled_path, ignore_errors=True)
+            tmp_path.rename(compiled_path)
+            logger.info(f"Compiled model cache written to {compiled_path}")
+            self._prune_compiled_cache(compiled_path, compiled_path.parent)
+        except Exception as e:
+            logger.warning(f"Failed to write compiled model cache (non-fatal): {e}")
+            shutil.rmtree(tmp_path, ignore_errors=True)
+    
     def load_model(self, model_name: str) -> bool:
         """Load model from cache or download if needed.
         
@@ -136,14 +278,28 @@ class WhisperTranscriber:
         else:
             logger.info(f"Step 2: Model found in cache at {model_path}")
         
+        compiled_path = self._compiled_cache_path(model_name)
+        # Repos that already ship safetensors are mmapped directly; a compiled
+        # copy would only duplicate the weights on disk
+        needs_compiled = not (model_path / "weights.safetensors").exists()
+        if not needs_compiled:
+            self._prune_compiled_cache(None, compiled_path.parent)
+        use_compiled = needs_compiled and (compiled_path / "weights.safetensors").exists()
+        load_path = compiled_path if use_compiled else model_path
+        
         try:
             with self._lock:
-                logger.info(f"Step 3: Loading model from {model_path}")
+                logger.info(f"Step 3: Loading model from {load_path}")
                 # Use the correct mlx-whisper API
-                self.model = load_model(str(model_path))
+                model = load_model(str(load_path))
+                self.model = model
                 self.current_model = model_name
-                logger.info(f"Step 4: Model '{model_name}' loaded successfully")
-                return True
+                self._model_path = load_path
+            logger.info(f"Step 4: Model '{model_name}' loaded successfully")
+            # Written outside the lock so transcription isn't held up by the copy
+            if needs_compiled and not use_compiled:
+                self._write_compiled_cache(model, model_path, compiled_path)
+            return True
                 
         except Exception as e:
             logger.error(f"Step 3: Error loading model - {e}", exc_info=True)
@@ -152,18 +308,26 @@ class WhisperTranscriber:
                 logger.info(f"Step 3 (retry): Attempting to load model using repo ID: {repo_id}")
                 self.model = load_model(repo_id)
                 self.current_model = model_name
+                self._model_path = None
                 logger.info(f"Step 4: Model '{model_name}' loaded successfully using repo ID")
                 return True
             except Exception as e2:
                 logger.error(f"Step 3 (retry): Alternative loading also failed - {e2}", exc_info=True)
                 return False
     
-    def transcribe(self, audio_data: np.ndarray, callback: Optional[Callable[[str], None]] = None) -> str:
+    def transcribe(
+        self,
+        audio_data: np.ndarray,
+        callback: Optional[Callable[[str], None]] = None,
+        **decode_options
+    ) -> str:
         """Transcribe audio data using loaded model.
         
         Args:
             audio_data: Audio data as numpy array (16kHz, mono, float32)
             callback: Optional callback function called with transcription result
+            **decode_options: Extra options forwarded to mlx_whisper.transcribe
+                (e.g. temperature, condition_on_previous_text)
             
         Returns:
             Transcribed text
@@ -193,12 +357,15 @@ class WhisperTranscriber:
                 logger.info(f"Step 3: Running transcription (audio length: {len(audio_data_float)} samples)")
                 
                 # Use mlx_whisper.transcribe with path_or_hf_repo parameter
-                # Get the repo ID for the current model
-                repo_id = self.MODEL_VARIANTS.get(self.current_model, "mlx-community/whisper-tiny")
-                logger.debug(f"Using model repo: {repo_id}")
+                # Prefer the local directory the model was loaded from, else the repo ID
+                if self._model_path is not None:
+                    model_ref = str(self._model_path)
+                else:
+                    model_ref = self.MODEL_VARIANTS.get(self.current_model, "mlx-community/whisper-tiny")
+                logger.debug(f"Using model: {model_ref}")
                 
-                # mlx_whisper.transcribe can work with repo ID directly
-                result = mlx_whisper.transcribe(audio_data_float, path_or_hf_repo=repo_id)
+                # mlx_whisper.transcribe can work with a local path or repo ID directly
+                result = mlx_whisper.transcribe(audio_data_float, path_or_hf_repo=model_ref, **decode_options)
                 
                 logger.info("Step 4: Transcription completed, extracting text")
                 
@@ -238,24 +405,39 @@ class WhisperTranscriber:
         
         return result_container["text"]
     
-    def transcribe_async(self, audio_data: np.ndarray, callback: Callable[[str], None]):
+    def transcribe_async(
+        self,
+        audio_data: np.ndarray,
+        callback: Callable[[str], None],
+        **decode_options
+    ) -> Future:
         """Transcribe audio asynchronously in background thread.
         
         Args:
             audio_data: Audio data as numpy array
             callback: Callback function called with transcription result
+            **decode_options: Extra options forwarded to mlx_whisper.transcribe
+            
+        Returns:
+            Future resolved with the transcribed text after the callback has run
         """
         logger.info("Starting async transcription")
+        future: Future = Future()
+        
         def _transcribe():
+            text = ""
             try:
-                text = self.transcribe(audio_data)
+                text = self.transcribe(audio_data, **decode_options)
                 logger.info("Async transcription completed successfully")
                 callback(text)
             except Exception as e:
                 logger.error(f"Async transcription error: {e}", exc_info=True)
                 callback("")
+            finally:
+                future.set_result(text)
         
         thread = threading.Thread(target=_transcribe, daemon=True)
         thread.start()
         logger.debug("Async transcription thread started")
+        return future
 
@@ -29,6 +29,20 @@ class SileroVAD:
         self.session: Optional[ort.InferenceSession] = None
         self._state = None  # State for streaming (shape: [2, batch, 128])
         logger.info("SileroVAD initialized successfully")
+    
+    def _create_session(self, model_path: Path) -> ort.InferenceSession:
+        """Create an ONNX Runtime session with full graph optimizations."""
+        session_options = ort.SessionOptions()
+        session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        # Use CPU provider for compatibility (can be optimized later)
+        providers = ['CPUExecutionProvider']
+        session = ort.InferenceSession(
+            str(model_path),
+            sess_options=session_options,
+            providers=providers
+        )
+        logger.debug(f"ONNX Runtime session created for {model_path} with providers: {providers}")
+        return session
         
     def load_vad_model(self) -> bool:
         """Load ONNX model from silero-vad package.
@@ -68,14 +82,8 @@ class SileroVAD:
                 return False
             
             # Create ONNX Runtime session
-            # Use CPU provider for compatibility (can be optimized later)
             logger.info("Step 3: Creating ONNX Runtime session")
-            providers = ['CPUExecutionProvider']
-            self.session = ort.InferenceSession(
-                str(self.model_path),
-                providers=providers
-            )
-            logger.debug(f"Step 3: ONNX Runtime session created with providers: {providers}")
+            self.session = self._create_session(self.model_path)
             
             # Initialize hidden states for streaming
             self._reset_states()
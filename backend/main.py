@@ -1,14 +1,20 @@
 """Main application entry point for LocalFlow."""
 import logging
 import os
+import re
 import sys
 import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
+import numpy as np
 import rumps
-from pynput import keyboard
+
+if TYPE_CHECKING:
+    from pynput import keyboard
 
 try:
     import Quartz
@@ -17,6 +23,11 @@ except ImportError:
     Quartz = None
     NSDictionary = None
 
+try:
+    from PyObjCTools import AppHelper
+except ImportError:
+    AppHelper = None
+
 import config
 from engine.audio import AudioRecorder
 from engine.injector import TextInjector
@@ -28,14 +39,37 @@ try:
 except ImportError:
     sd = None
 
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+_BANNER = "=" * 60
+# Frame hotkey/recording log sections with banner lines only when asked for
+_VERBOSE_BANNERS = os.environ.get("LOCALFLOW_VERBOSE_BANNERS") == "1"
+LOOP_BLOCKING_THRESHOLD = 0.01  # Seconds; event loop callbacks slower than this are logged
+# Classify AudioRecorder start errors for user-facing hints
+_MIC_ERROR_RE = re.compile(r"microphone|device", re.IGNORECASE)
+_SYSTEM_ERROR_RE = re.compile(r"system", re.IGNORECASE)
+
+
+def _configure_logging():
+    """Configure root logging to stdout with a single prebuilt formatter."""
+    formatter = logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(formatter)
+    logging.basicConfig(
+        level=logging.INFO,
+        handlers=[handler],
+        force=True  # Force reconfiguration if already configured
+    )
+
+
 # Configure logging with unbuffered output
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S',
-    stream=sys.stdout,
-    force=True  # Force reconfiguration if already configured
-)
+_configure_logging()
 # Ensure unbuffered output for immediate log visibility
 try:
     if hasattr(sys.stdout, 'reconfigure'):
@@ -47,69 +81,97 @@ except (AttributeError, OSError):
 logger = logging.getLogger(__name__)
 
 
+def _log_section(*lines: str):
+    """Log lines at INFO, framed by banners when LOCALFLOW_VERBOSE_BANNERS=1."""
+    if _VERBOSE_BANNERS:
+        logger.info(_BANNER)
+    for line in lines:
+        logger.info(line)
+    if _VERBOSE_BANNERS:
+        logger.info(_BANNER)
+
+
+@lru_cache(maxsize=None)
+def _get_keyboard():
+    """Import pynput's keyboard module on first use.
+    
+    pynput pulls in its platform backend at import time; deferring it keeps
+    server mode, which never registers a global hotkey, from paying for it.
+    """
+    from pynput import keyboard
+    return keyboard
+
+
 class LocalFlowApp(rumps.App):
     """Main LocalFlow application with menubar integration."""
     
+    WARMUP_WAIT_TIMEOUT = 2.0  # Max seconds _stop_recording waits for warmup
+    DIAG_BUFFER_SIZE = 4096  # Diagnostic key event ring size (power of two)
+    DIAG_FLUSH_INTERVAL = 0.1  # Seconds between diagnostic log flushes
+    PERMISSION_CACHE_TTL = 5.0  # Seconds an Accessibility permission check result is reused
+    IDLE_TITLE = "LocalFlow"
+    TRANSCRIBING_TITLE = "⏳"
+    SHUTDOWN_TIMEOUT = 2.0  # Shared deadline for concurrent shutdown steps
+    
     def __init__(self):
         """Initialize LocalFlow application."""
-        logger.info("=" * 60)
+        logger.info(_BANNER)
         logger.info("Initializing LocalFlow Application")
-        logger.info("=" * 60)
+        logger.info(_BANNER)
         
-        super(LocalFlowApp, self).__init__("LocalFlow", quit_button=None)
+        super(LocalFlowApp, self).__init__(self.IDLE_TITLE, quit_button=None)
         
         # Load configuration
         logger.info("Step 1: Loading configuration")
         self.config = config.load_config()
+        self._decode_options = self.config.get("decode_options", config.DEFAULT_DECODE_OPTIONS)
         logger.info("Step 1: Configuration loaded successfully")
         
-        # Initialize components
-        logger.info("Step 2: Initializing audio recorder")
-        self.audio_recorder = AudioRecorder()
-        
         logger.info("Step 3: Initializing transcriber")
         self.transcriber = WhisperTranscriber(
             cache_dir=config.expand_cache_dir(self.config.get("cache_dir", "~/.cache/local_whisper"))
         )
         
-        logger.info("Step 4: Initializing text injector")
-        self.injector = TextInjector()
-        
-        self.vad: Optional[SileroVAD] = None
-        
-        # Initialize VAD if enabled
-        if self.config.get("vad_enabled", True):
-            logger.info("Step 5: Initializing VAD (Voice Activity Detection)")
-            self.vad = SileroVAD()
-            vad_success = self.vad.load_vad_model()
-            if vad_success:
-                logger.info("Step 5: VAD initialized successfully")
-            else:
-                logger.warning("Step 5: VAD initialization failed, continuing without VAD")
-        else:
-            logger.info("Step 5: VAD disabled in configuration")
-        
-        # Load default model
-        logger.info("Step 6: Loading default Whisper model")
-        model_name = self.config.get("model", "mlx-community/whisper-large-v3-turbo")
-        # Extract variant from model name
-        model_variant = self._extract_model_variant(model_name)
-        if model_variant:
-            model_success = self.transcriber.load_model(model_variant)
-            if model_success:
-                logger.info(f"Step 6: Default model '{model_variant}' loaded successfully")
-            else:
-                logger.error(f"Step 6: Failed to load default model '{model_variant}'")
-        else:
-            logger.warning(f"Step 6: Could not extract variant from model name '{model_name}'")
+        # Initialize the remaining components concurrently. Model and VAD loading are
+        # mostly disk I/O and native code, so startup takes roughly the slowest load
+        # instead of the sum of all of them.
+        with ThreadPoolExecutor(max_workers=4, thread_name_prefix="lf-init") as init_pool:
+            logger.info("Step 2: Initializing audio recorder")
+            audio_future = init_pool.submit(AudioRecorder)
+            logger.info("Step 4: Initializing text injector")
+            injector_future = init_pool.submit(TextInjector)
+            vad_future = init_pool.submit(self._init_vad)
+            model_future = init_pool.submit(self._load_default_model)
+            
+            self.audio_recorder = audio_future.result()
+            self.injector = injector_future.result()
+            self.vad: Optional[SileroVAD] = vad_future.result()
+            model_future.result()
         
         # State management
         self.is_recording = False
-        self.hotkey_listener: Optional[keyboard.Listener] = None
+        self.hotkey_listener: Optional["keyboard.Listener"] = None
         self.current_hotkey: Optional[dict] = None
-        self._active_threads = []  # Track active threads for cleanup
+        # Worker pool for hotkey handling and audio processing (reuses threads)
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="lf")
+        self._pool_futures: set[Future] = set()  # Submitted pool tasks that haven't finished
+        self._pool_futures_lock = threading.Lock()
+        self._transcriptions_in_flight = 0  # Only changed on the main thread
         self._permission_checked = False  # Track if we've shown permission alert
         self._diagnostic_mode = False  # Track diagnostic mode for logging all key events
+        # Ring buffer of raw key events recorded by the listener thread in diagnostic mode
+        self._diag_keys = [None] * self.DIAG_BUFFER_SIZE
+        self._diag_pressed = [False] * self.DIAG_BUFFER_SIZE
+        self._diag_idx = 0  # Total events written (only the listener thread writes)
+        self._diag_flushed_idx = 0  # Total events already logged
+        self._diag_stop = threading.Event()  # Set to end the diagnostic flush thread
+        self._diag_thread: Optional[threading.Thread] = None
+        self._device_cache: Optional[tuple] = None  # Resolved (mic, system) device indices
+        self._perm_cache: Optional[tuple] = None  # (monotonic timestamp, trusted)
+        self._warm_ready = threading.Event()  # Set once transcriber/VAD warmup has run
+        self._mode = "toggle"
+        self._debounce_interval = 0.2
+        self._load_hotkey_settings()
         
         # Setup menu
         logger.info("Step 8: Setting up menu")
@@ -123,11 +185,69 @@ class LocalFlowApp(rumps.App):
         logger.info("Step 7: Checking Accessibility permissions")
         self._check_startup_permissions()
         
-        logger.info("=" * 60)
+        # Warm up transcriber and VAD so the first hotkey press is not slowed by one-time compilation
+        logger.info("Step 10: Starting background warmup")
+        threading.Thread(target=self._warmup, daemon=True).start()
+        
+        logger.info(_BANNER)
         logger.info("LocalFlow started successfully. Check the menu bar for options.")
-        logger.info("=" * 60)
+        logger.info(_BANNER)
         sys.stdout.flush()  # Ensure logs are flushed
     
+    def _init_vad(self) -> Optional[SileroVAD]:
+        """Create and load the VAD model if enabled in configuration.
+        
+        Returns:
+            SileroVAD instance (session is None if loading failed), or None if disabled
+        """
+        if not self.config.get("vad_enabled", True):
+            logger.info("Step 5: VAD disabled in configuration")
+            return None
+        
+        logger.info("Step 5: Initializing VAD (Voice Activity Detection)")
+        vad = SileroVAD()
+        if vad.load_vad_model():
+            logger.info("Step 5: VAD initialized successfully")
+        else:
+            logger.warning("Step 5: VAD initialization failed, continuing without VAD")
+        return vad
+    
+    def _load_default_model(self):
+        """Load the Whisper model configured in config.json."""
+        logger.info("Step 6: Loading default Whisper model")
+        model_name = self.config.get("model", "mlx-community/whisper-large-v3-turbo")
+        # Extract variant from model name
+        model_variant = self._extract_model_variant(model_name)
+        if model_variant:
+            model_success = self.transcriber.load_model(model_variant)
+            if model_success:
+                logger.info(f"Step 6: Default model '{model_variant}' loaded successfully")
+            else:
+                logger.error(f"Step 6: Failed to load default model '{model_variant}'")
+        else:
+            logger.warning(f"Step 6: Could not extract variant from model name '{model_name}'")
+    
+    def _warmup(self):
+        """Run one silent transcription and VAD pass to trigger one-time setup costs.
+        
+        MLX compiles kernels and prepares Metal shaders on first execution, and ONNX
+        Runtime optimizes the graph on the first run. Doing this at startup keeps
+        the first real recording at steady-state latency.
+        """
+        silence = np.zeros(self.audio_recorder.SAMPLE_RATE, dtype=np.float32)
+        try:
+            if self.transcriber.current_model is not None:
+                logger.info("Warmup: Running silent transcription")
+                self.transcriber.transcribe(silence, **self._decode_options)
+            if self.vad and self.vad.session is not None:
+                logger.info("Warmup: Running VAD forward pass")
+                self.vad.find_speech_boundaries(silence)
+            logger.info("Warmup: Completed")
+        except Exception as e:
+            logger.warning(f"Warmup failed (non-fatal): {e}", exc_info=True)
+        finally:
+            self._warm_ready.set()
+    
     def _extract_model_variant(self, model_name: str) -> Optional[str]:
         """Extract model variant from full model name.
         
@@ -137,6 +257,13 @@ class LocalFlowApp(rumps.App):
         Returns:
             Variant name like "large-turbo" or None
         """
+        # Exact repo ids and variant names resolve with a dict lookup
+        variant = WhisperTranscriber.REPO_TO_VARIANT.get(model_name)
+        if variant is not None:
+            return variant
+        if model_name in WhisperTranscriber.MODEL_VARIANTS:
+            return model_name
+        
         model_lower = model_name.lower()
         
         if "large-v3-turbo" in model_lower or "large-turbo" in model_lower:
@@ -182,8 +309,8 @@ class LocalFlowApp(rumps.App):
             # Check if it's a permission issue
             if not self._check_accessibility_permissions():
                 logger.warning("Hotkey listener failed - Accessibility permissions may be missing")
-                # Show alert in a thread-safe way
-                threading.Timer(1.0, self._show_permission_alert).start()
+                # Show alert from the main run loop once the app is running
+                self._schedule_permission_alert(1.0)
             else:
                 rumps.alert(
                     title="Hotkey Setup Failed",
@@ -193,11 +320,22 @@ class LocalFlowApp(rumps.App):
                     ok="OK"
                 )
     
+    def _load_hotkey_settings(self):
+        """Cache hotkey-related config values read on every key event.
+        
+        Called on startup and whenever the hotkey is (re)registered, so the
+        key handlers only do plain attribute reads.
+        """
+        self._mode = self.config.get("mode", "toggle")
+        self._debounce_interval = self.config.get("debounce_ms", 200) / 1000.0
+    
     def _register_hotkey(self):
         """Register global hotkey."""
         if not self.current_hotkey:
             return
         
+        self._load_hotkey_settings()
+        
         # Stop existing listener
         if self.hotkey_listener:
             try:
@@ -205,7 +343,9 @@ class LocalFlowApp(rumps.App):
             except Exception:
                 pass
         
-        modifiers = self.current_hotkey.get("modifiers", [])
+        keyboard = _get_keyboard()
+        # Deduplicate so each modifier gets exactly one bit below
+        modifiers = config.canonical_modifiers(self.current_hotkey.get("modifiers", []))
         key_name = self.current_hotkey.get("key", "").lower()
         
         logger.info(f"Registering hotkey - modifiers: {modifiers}, key: {key_name}")
@@ -231,82 +371,79 @@ class LocalFlowApp(rumps.App):
             # Try to use as character key
             main_key = key_name
         
+        if main_key in modifier_keys:
+            raise ValueError(f"Hotkey key '{key_name}' is also one of its modifiers")
+        
         logger.info(f"Hotkey combination: {modifiers} + {key_name}")
         
-        # Track pressed keys for hotkey detection
-        pressed_keys = set()
+        # Assign one bit per key of the combination, so tracking pressed keys is
+        # an OR/AND-NOT on an int and matching is a single mask comparison
+        key_bits = {mod_key: 1 << i for i, mod_key in enumerate(modifier_keys)}
+        char_bits = {}
+        main_bit = 1 << len(modifier_keys)
+        if isinstance(main_key, keyboard.Key):
+            key_bits[main_key] = main_bit
+        else:
+            char_bits[main_key] = main_bit
+        target_mask = (main_bit << 1) - 1
+        
+        # Bitmask of currently pressed hotkey keys
+        pressed_state = 0
         last_trigger_time = 0.0
-        debounce_interval = 0.2  # 200ms debounce
+        
+        def key_bit(key) -> int:
+            """Return the hotkey bit for a key event, or 0 if not part of the hotkey."""
+            char = getattr(key, 'char', None)
+            if char is None:
+                return key_bits.get(key, 0)
+            return char_bits.get(char, 0)
         
         def check_hotkey_combination():
             """Check if the hotkey combination is currently pressed."""
-            # Check if main key is pressed
-            main_key_pressed = False
-            if isinstance(main_key, keyboard.Key):
-                main_key_pressed = main_key in pressed_keys
-            else:
-                # For character keys, check if any pressed key matches
-                for key in pressed_keys:
-                    if hasattr(key, 'char') and key.char == main_key:
-                        main_key_pressed = True
-                        break
-            
-            if not main_key_pressed:
-                return False
-            
-            # Check if all modifiers are pressed
-            for mod_key in modifier_keys:
-                if mod_key not in pressed_keys:
-                    return False
-            
-            return True
+            return (pressed_state & target_mask) == target_mask
         
         def on_press(key):
-            nonlocal last_trigger_time
+            nonlocal last_trigger_time, pressed_state
             try:
-                key_str = str(key)
                 if self._diagnostic_mode:
-                    logger.debug(f"[DIAGNOSTIC] Key pressed: {key_str}")
+                    slot = self._diag_idx & (self.DIAG_BUFFER_SIZE - 1)
+                    self._diag_keys[slot] = key
+                    self._diag_pressed[slot] = True
+                    self._diag_idx += 1
                 
-                pressed_keys.add(key)
+                pressed_state |= key_bit(key)
                 
                 # Check if hotkey combination is triggered
                 if check_hotkey_combination():
                     current_time = time.time()
                     # Debounce: only trigger if enough time has passed since last trigger
-                    if current_time - last_trigger_time >= debounce_interval:
-                        logger.info("=" * 60)
-                        logger.info("HOTKEY COMBINATION DETECTED - Triggering callback!")
-                        logger.info("=" * 60)
+                    if current_time - last_trigger_time >= self._debounce_interval:
+                        _log_section("HOTKEY COMBINATION DETECTED - Triggering callback!")
                         last_trigger_time = current_time
-                        # Trigger in a separate thread to avoid blocking key events
-                        threading.Thread(target=self._on_hotkey_triggered, daemon=True).start()
+                        # Trigger on a worker thread to avoid blocking key events
+                        self._submit(self._on_hotkey_triggered)
                     else:
-                        logger.debug(f"Hotkey combination detected but debounced (last trigger: {current_time - last_trigger_time:.3f}s ago)")
+                        logger.debug("Hotkey combination detected but debounced (last trigger: %.3fs ago)",
+                                     current_time - last_trigger_time)
             except Exception as e:
                 logger.error(f"Error in hotkey press handler for key {key}: {e}", exc_info=True)
         
         def on_release(key):
+            nonlocal pressed_state
             try:
-                key_str = str(key)
                 if self._diagnostic_mode:
-                    logger.debug(f"[DIAGNOSTIC] Key released: {key_str}")
+                    slot = self._diag_idx & (self.DIAG_BUFFER_SIZE - 1)
+                    self._diag_keys[slot] = key
+                    self._diag_pressed[slot] = False
+                    self._diag_idx += 1
                 
-                pressed_keys.discard(key)
+                bit = key_bit(key)
+                pressed_state &= ~bit
                 
                 # For hold mode, check if main key is released
-                mode = self.config.get("mode", "toggle")
-                if mode == "hold" and self.is_recording:
-                    # Check if the main key is released
-                    if isinstance(main_key, keyboard.Key):
-                        if key == main_key:
-                            logger.info("Main key released in hold mode, stopping recording")
-                            self._stop_recording()
-                    else:
-                        # For character keys
-                        if hasattr(key, 'char') and key.char == main_key:
-                            logger.info("Main key released in hold mode, stopping recording")
-                            self._stop_recording()
+                if bit == main_bit and self._mode == "hold" and self.is_recording:
+                    logger.info("Main key released in hold mode, stopping recording")
+                    self._stop_recording()
             except Exception as e:
                 logger.error(f"Error in hotkey release handler for key {key}: {e}", exc_info=True)
         
@@ -343,10 +480,8 @@ class LocalFlowApp(rumps.App):
     
     def _on_hotkey_triggered(self):
         """Handle hotkey trigger."""
-        logger.info("=" * 60)
-        logger.info("HOTKEY TRIGGERED - Handler called successfully!")
-        logger.info("=" * 60)
-        mode = self.config.get("mode", "toggle")
+        mode = self._mode
+        _log_section("HOTKEY TRIGGERED - Handler called successfully!")
         logger.info(f"Current mode: {mode}, is_recording: {self.is_recording}")
         
         if mode == "toggle":
@@ -363,12 +498,22 @@ class LocalFlowApp(rumps.App):
             else:
                 logger.info("Hold mode: Already recording, ignoring trigger")
     
+    def _invalidate_device_cache(self):
+        """Forget the resolved audio devices so the next recording re-detects them."""
+        self._device_cache = None
+    
     def _detect_audio_devices(self):
         """Detect and return microphone and system audio device indices.
         
+        The result is memoized until a recording fails to start, since PortAudio
+        only sees device changes after re-initialization anyway.
+        
         Returns:
             Tuple of (microphone_device, system_audio_device) indices, or None if not found
         """
+        if self._device_cache is not None:
+            return self._device_cache
+        
         audio_config = self.config.get("audio", {})
         auto_detect = audio_config.get("auto_detect_devices", True)
         
@@ -399,17 +544,21 @@ class LocalFlowApp(rumps.App):
                     logger.info("No BlackHole device found for system audio capture")
                     logger.info("To capture system audio, install BlackHole from: https://github.com/ExistentialAudio/BlackHole")
         
+        if mic_device is not None:
+            self._device_cache = (mic_device, system_device)
         return mic_device, system_device
     
     def _start_recording(self):
-        """Start recording audio."""
+        """Start recording audio.
+        
+        Runs on a worker thread when triggered by the hotkey, so alerts are
+        dispatched to the main thread.
+        """
         if self.is_recording:
             logger.warning("Recording already in progress, ignoring start request")
             return
         
-        logger.info("=" * 60)
-        logger.info("=== STARTING RECORDING ===")
-        logger.info("=" * 60)
+        _log_section("=== STARTING RECORDING ===")
         self.is_recording = True
         
         # Detect audio devices
@@ -422,11 +571,7 @@ class LocalFlowApp(rumps.App):
                     "Please check your audio settings and ensure a microphone is connected."
                 )
                 logger.error(error_msg)
-                rumps.alert(
-                    title="No Microphone Found",
-                    message=error_msg,
-                    ok="OK"
-                )
+                self._run_on_main(self._show_alert, "No Microphone Found", error_msg)
                 self.is_recording = False
                 return
             
@@ -446,9 +591,10 @@ class LocalFlowApp(rumps.App):
             except RuntimeError as e:
                 error_msg = str(e)
                 logger.error(f"Failed to start recording: {error_msg}")
+                self._invalidate_device_cache()
                 
                 # Provide helpful error messages
-                if "microphone" in error_msg.lower() or "device" in error_msg.lower():
+                if _MIC_ERROR_RE.search(error_msg):
                     user_msg = (
                         f"Failed to start audio recording:\n{error_msg}\n\n"
                         "Please check:\n"
@@ -456,7 +602,7 @@ class LocalFlowApp(rumps.App):
                         "• Microphone permissions are granted\n"
                         "• Audio device settings in Preferences"
                     )
-                elif system_device is not None and "system" in error_msg.lower():
+                elif system_device is not None and _SYSTEM_ERROR_RE.search(error_msg):
                     user_msg = (
                         f"Failed to start system audio recording:\n{error_msg}\n\n"
                         "To capture system audio:\n"
@@ -467,19 +613,12 @@ class LocalFlowApp(rumps.App):
                 else:
                     user_msg = f"Failed to start recording: {error_msg}"
                 
-                rumps.alert(
-                    title="Recording Error",
-                    message=user_msg,
-                    ok="OK"
-                )
+                self._run_on_main(self._show_alert, "Recording Error", user_msg)
                 self.is_recording = False
         except Exception as e:
             logger.error(f"Unexpected error starting recording: {e}", exc_info=True)
-            rumps.alert(
-                title="Recording Error",
-                message=f"An unexpected error occurred: {e}",
-                ok="OK"
-            )
+            self._invalidate_device_cache()
+            self._run_on_main(self._show_alert, "Recording Error", f"An unexpected error occurred: {e}")
             self.is_recording = False
     
     def _stop_recording(self):
@@ -495,50 +634,57 @@ class LocalFlowApp(rumps.App):
         logger.debug("Stopping audio recorder")
         audio_data = self.audio_recorder.stop_recording()
         
-        if len(audio_data) == 0:
+        if audio_data.size == 0:
             logger.warning("No audio recorded, nothing to process")
             return
         
-        audio_duration = len(audio_data) / self.audio_recorder.SAMPLE_RATE
-        logger.info("=" * 60)
-        logger.info("=== RECORDING FINISHED ===")
-        logger.info(f"Audio captured: {len(audio_data)} samples ({audio_duration:.2f} seconds)")
-        logger.info("=" * 60)
-        
-        # Trim silence using VAD if available
-        audio_to_transcribe = audio_data
-        if self.vad and self.vad.session is not None:
-            try:
-                logger.info("Using VAD to trim silence from audio")
-                start_idx, end_idx = self.vad.find_speech_boundaries(audio_data, padding_ms=100)
-                if start_idx < end_idx:
-                    audio_to_transcribe = audio_data[start_idx:end_idx]
-                    trimmed_duration = len(audio_to_transcribe) / self.audio_recorder.SAMPLE_RATE
-                    logger.info(f"VAD trimming: {len(audio_data)} -> {len(audio_to_transcribe)} samples "
-                              f"({audio_duration:.2f}s -> {trimmed_duration:.2f}s)")
-                else:
-                    logger.warning("VAD returned invalid boundaries, using full audio")
-            except Exception as e:
-                logger.warning(f"VAD trimming failed: {e}, using full audio", exc_info=True)
-        else:
-            logger.info("VAD not available, transcribing full audio")
+        audio_duration = audio_data.size / self.audio_recorder.SAMPLE_RATE
+        _log_section(
+            "=== RECORDING FINISHED ===",
+            f"Audio captured: {audio_data.size} samples ({audio_duration:.2f} seconds)"
+        )
         
         logger.info(f"Starting transcription...")
+        self._run_on_main(self._begin_transcription)
         
-        # Process audio in background thread
+        # Process audio in background thread; this can be reached from the
+        # hotkey listener or the main thread, neither of which may block
         def process_audio():
             try:
                 logger.info("Processing audio in background thread")
+                
+                # Don't race the warmup pass for the transcriber/VAD
+                if not self._warm_ready.wait(timeout=self.WARMUP_WAIT_TIMEOUT):
+                    logger.warning("Warmup still running, continuing without waiting")
+                
+                # Trim silence using VAD if available
+                audio_to_transcribe = audio_data
+                if self.vad and self.vad.session is not None:
+                    try:
+                        logger.info("Using VAD to trim silence from audio")
+                        start_idx, end_idx = self.vad.find_speech_boundaries(audio_data, padding_ms=100)
+                        if start_idx < end_idx:
+                            audio_to_transcribe = audio_data[start_idx:end_idx]
+                            trimmed_duration = audio_to_transcribe.size / self.audio_recorder.SAMPLE_RATE
+                            logger.info(f"VAD trimming: {audio_data.size} -> {audio_to_transcribe.size} samples "
+                                      f"({audio_duration:.2f}s -> {trimmed_duration:.2f}s)")
+                        else:
+                            logger.warning("VAD returned invalid boundaries, using full audio")
+                    except Exception as e:
+                        logger.warning(f"VAD trimming failed: {e}, using full audio", exc_info=True)
+                else:
+                    logger.info("VAD not available, transcribing full audio")
+                
                 # Transcribe audio
                 def on_transcription_complete(text: str):
-                    logger.info("=" * 60)
+                    logger.info(_BANNER)
                     logger.info("=== TRANSCRIPTION RESULT ===")
                     if text:
                         logger.info(f"Transcribed text: {text}")
                         logger.info(f"Text length: {len(text)} characters")
                     else:
                         logger.warning("No transcription result (empty text)")
-                    logger.info("=" * 60)
+                    logger.info(_BANNER)
                     
                     # Text injection commented out - focus on detection quality testing
                     # logger.info("Step 4: Attempting to inject text")
@@ -551,15 +697,74 @@ class LocalFlowApp(rumps.App):
                     logger.info("Recording session completed")
                 
                 logger.info("Starting async transcription")
-                self.transcriber.transcribe_async(audio_to_transcribe, on_transcription_complete)
+                future = self.transcriber.transcribe_async(
+                    audio_to_transcribe, on_transcription_complete, **self._decode_options
+                )
+                # Menu bar work overlaps with transcription; release the title when it finishes
+                future.add_done_callback(lambda _: self._run_on_main(self._end_transcription))
                 
             except Exception as e:
                 logger.error(f"Error processing audio: {e}", exc_info=True)
+                self._run_on_main(self._end_transcription)
         
-        process_thread = threading.Thread(target=process_audio, daemon=True)
-        process_thread.start()
-        self._active_threads.append(process_thread)
-        logger.debug("Audio processing thread started")
+        self._submit(process_audio)
+        logger.debug("Audio processing task submitted")
+    
+    @staticmethod
+    def _run_on_main(fn, *args):
+        """Run a callable on the main (Cocoa) thread without waiting for it."""
+        if AppHelper is not None:
+            AppHelper.callAfter(fn, *args)
+        else:
+            fn(*args)
+    
+    @staticmethod
+    def _show_alert(title: str, message: str):
+        """Show a modal alert. Must be called on the main thread."""
+        rumps.alert(title=title, message=message, ok="OK")
+    
+    @staticmethod
+    def _post_notification(title: str, message: str, subtitle: str):
+        """Post a user notification. Must be called on the main thread."""
+        rumps.notification(title=title, message=message, subtitle=subtitle)
+    
+    def _set_title(self, title: str):
+        """Set the menu bar title. Must be called on the main thread."""
+        self.title = title
+    
+    def _begin_transcription(self):
+        """Count a transcription as in flight and show it in the menu bar. Main thread only."""
+        self._transcriptions_in_flight += 1
+        self._set_title(self.TRANSCRIBING_TITLE)
+    
+    def _end_transcription(self):
+        """Restore the idle title once no transcription is in flight. Main thread only."""
+        self._transcriptions_in_flight = max(0, self._transcriptions_in_flight - 1)
+        if self._transcriptions_in_flight == 0:
+            self._set_title(self.IDLE_TITLE)
+    
+    def _submit(self, fn) -> Future:
+        """Run a callable on the worker pool, logging any exception it raises."""
+        future = self._pool.submit(fn)
+        with self._pool_futures_lock:
+            self._pool_futures.add(future)
+        future.add_done_callback(self._log_task_exception)
+        future.add_done_callback(self._discard_pool_future)
+        return future
+    
+    def _discard_pool_future(self, future: Future):
+        """Stop tracking a finished worker pool task."""
+        with self._pool_futures_lock:
+            self._pool_futures.discard(future)
+    
+    @staticmethod
+    def _log_task_exception(future: Future):
+        """Log an exception raised by a worker pool task."""
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if exc is not None:
+            logger.error(f"Background task failed: {exc}", exc_info=exc)
     
     def _cancel_recording(self):
         """Cancel recording."""
@@ -576,6 +781,23 @@ class LocalFlowApp(rumps.App):
     def _check_accessibility_permissions(self) -> bool:
         """Check if Accessibility permissions are granted for keyboard monitoring.
         
+        The result is cached for PERMISSION_CACHE_TTL seconds to avoid repeated
+        Accessibility API round-trips from startup, menu and error paths.
+        
+        Returns:
+            True if permissions granted, False otherwise
+        """
+        now = time.monotonic()
+        if self._perm_cache is not None and now - self._perm_cache[0] < self.PERMISSION_CACHE_TTL:
+            return self._perm_cache[1]
+        
+        trusted = self._query_accessibility_permissions()
+        self._perm_cache = (now, trusted)
+        return trusted
+    
+    def _query_accessibility_permissions(self) -> bool:
+        """Query the Accessibility API for the current permission state.
+        
         Returns:
             True if permissions granted, False otherwise
         """
@@ -584,18 +806,18 @@ class LocalFlowApp(rumps.App):
             return False
         
         try:
-            import os
             current_pid = os.getpid()
             
             # Try to get process name if psutil is available
-            try:
-                import psutil
-                current_process = psutil.Process(current_pid)
-                process_name = current_process.name()
+            process_name = None
+            if psutil is not None:
+                try:
+                    process_name = psutil.Process(current_pid).name()
+                except Exception:
+                    pass
+            if process_name:
                 logger.info(f"Checking Accessibility permissions for process: {process_name} (PID: {current_pid})")
-            except ImportError:
-                logger.info(f"Checking Accessibility permissions for current process (PID: {current_pid})")
-            except Exception:
+            else:
                 logger.info(f"Checking Accessibility permissions for current process (PID: {current_pid})")
             
             trusted = False
@@ -624,16 +846,6 @@ class LocalFlowApp(rumps.App):
                 logger.warning("Please enable permissions for: Python, python3, or the terminal app you're using")
             
             return trusted
-        except ImportError:
-            logger.warning("psutil not available - cannot show process name in permission check")
-            # Continue with basic check
-            try:
-                trusted = Quartz.AXIsProcessTrustedWithOptions(None)
-                logger.info(f"Permission check result: {trusted}")
-                return trusted
-            except Exception as e:
-                logger.warning(f"Error checking Accessibility permissions: {e}")
-                return False
         except Exception as e:
             logger.warning(f"Error checking Accessibility permissions: {e}")
             return False
@@ -648,10 +860,21 @@ class LocalFlowApp(rumps.App):
         
         if not has_permissions:
             # Show alert after a short delay to avoid blocking startup
-            threading.Timer(2.0, self._show_permission_alert).start()
+            self._schedule_permission_alert(2.0)
         
         self._permission_checked = True
     
+    def _schedule_permission_alert(self, delay: float):
+        """Show the permission alert once after a delay, on the main run loop.
+        
+        Args:
+            delay: Seconds to wait before showing the alert
+        """
+        if AppHelper is not None:
+            AppHelper.callLater(delay, self._show_permission_alert)
+        else:
+            self._show_permission_alert()
+    
     def _show_permission_alert(self):
         """Show alert about missing Accessibility permissions."""
         rumps.alert(
@@ -688,15 +911,63 @@ class LocalFlowApp(rumps.App):
     
     def test_hotkey(self, _=None):
         """Manually test the hotkey handler."""
-        logger.info("=" * 60)
+        logger.info(_BANNER)
         logger.info("MANUAL HOTKEY TEST - Triggering handler directly")
-        logger.info("=" * 60)
+        logger.info(_BANNER)
         self._on_hotkey_triggered()
-        rumps.notification(
-            title="Hotkey Test",
-            message="Hotkey handler was triggered manually",
-            subtitle="Check logs to verify it worked"
+        self._run_on_main(
+            self._post_notification,
+            "Hotkey Test",
+            "Hotkey handler was triggered manually",
+            "Check logs to verify it worked"
+        )
+    
+    def _flush_diagnostic_events(self):
+        """Log key events recorded since the last flush as a single line.
+        
+        Runs on the diagnostic flush thread so the key handlers never format or log.
+        """
+        end = self._diag_idx
+        start = self._diag_flushed_idx
+        if end - start > self.DIAG_BUFFER_SIZE:
+            logger.warning(f"[DIAGNOSTIC] {end - start - self.DIAG_BUFFER_SIZE} key events dropped (buffer overrun)")
+            start = end - self.DIAG_BUFFER_SIZE
+        
+        if end > start:
+            mask = self.DIAG_BUFFER_SIZE - 1
+            events = " ".join(
+                f"{'+' if self._diag_pressed[i & mask] else '-'}{self._diag_keys[i & mask]}"
+                for i in range(start, end)
+            )
+            logger.info("[DIAGNOSTIC] Key events: %s", events)
+        self._diag_flushed_idx = end
+    
+    def _diagnostic_flush_loop(self, stop: threading.Event):
+        """Flush diagnostic key events every DIAG_FLUSH_INTERVAL until stopped.
+        
+        Args:
+            stop: Event set when diagnostic mode is turned off or the app quits;
+                events still buffered at that point are flushed before exiting
+        """
+        while not stop.wait(self.DIAG_FLUSH_INTERVAL):
+            self._flush_diagnostic_events()
+        self._flush_diagnostic_events()
+    
+    def _start_diagnostic_flush(self):
+        """Start the diagnostic flush thread."""
+        if self._diag_thread and self._diag_thread.is_alive():
+            # A stopped thread may still be doing its final flush
+            self._diag_thread.join(timeout=self.DIAG_FLUSH_INTERVAL)
+        # Skip events recorded before this session
+        self._diag_flushed_idx = self._diag_idx
+        self._diag_stop = threading.Event()
+        self._diag_thread = threading.Thread(
+            target=self._diagnostic_flush_loop,
+            args=(self._diag_stop,),
+            name="lf-diag-flush",
+            daemon=True
         )
+        self._diag_thread.start()
     
     def toggle_diagnostic_mode(self, sender=None):
         """Toggle diagnostic mode for logging all key events."""
@@ -704,10 +975,16 @@ class LocalFlowApp(rumps.App):
         status = "enabled" if self._diagnostic_mode else "disabled"
         logger.info(f"Diagnostic mode {status} - all key events will be logged")
         
-        rumps.notification(
-            title="Diagnostic Mode",
-            message=f"Diagnostic mode {status}",
-            subtitle="All key events will now be logged" if self._diagnostic_mode else "Only hotkey-related events will be logged"
+        if self._diagnostic_mode:
+            self._start_diagnostic_flush()
+        else:
+            self._diag_stop.set()
+        
+        self._run_on_main(
+            self._post_notification,
+            "Diagnostic Mode",
+            f"Diagnostic mode {status}",
+            "All key events will now be logged" if self._diagnostic_mode else "Only hotkey-related events will be logged"
         )
     
     def menu_start_recording(self, _=None):
@@ -729,44 +1006,65 @@ class LocalFlowApp(rumps.App):
     
     def quit_app(self, _=None):
         """Quit application."""
-        logger.info("=" * 60)
-        logger.info("Shutting down LocalFlow application")
-        logger.info("=" * 60)
+        logger.debug("Shutting down LocalFlow application")
+        steps = []
+        self._diag_stop.set()
         
-        # Stop hotkey listener
-        logger.info("Step 1: Stopping hotkey listener")
+        # Hotkey listener and audio touch disjoint resources, so stop them
+        # concurrently and bound the whole shutdown by a single deadline.
+        tasks = {}
         if self.hotkey_listener:
+            logger.debug("Step 1: Stopping hotkey listener")
+            tasks["hotkey_listener"] = self.hotkey_listener.stop
+        if self.is_recording:
+            logger.debug("Step 2: Stopping active recording")
+            tasks["recording"] = self._cancel_recording
+        elif self.audio_recorder and self.audio_recorder.is_recording:
+            logger.debug("Step 2: Cleaning up audio resources")
+            tasks["audio"] = self.audio_recorder.stop_recording
+        
+        # Daemon threads, so a step that hangs past the deadline can't hold up interpreter exit
+        errors = {}
+        
+        def run_step(name, fn):
             try:
-                self.hotkey_listener.stop()
-                logger.info("Step 1: Hotkey listener stopped")
+                fn()
             except Exception as e:
-                logger.error(f"Step 1: Error stopping hotkey listener: {e}", exc_info=True)
+                errors[name] = e
         
-        # Stop recording if active
-        if self.is_recording:
-            logger.info("Step 2: Stopping active recording")
-            self._cancel_recording()
+        threads = {}
+        for name, fn in tasks.items():
+            thread = threading.Thread(target=run_step, args=(name, fn), name=f"lf-quit-{name}", daemon=True)
+            thread.start()
+            threads[name] = thread
         
-        # Wait for active threads to complete (with timeout)
-        logger.info("Step 3: Waiting for active threads to complete")
-        for thread in self._active_threads:
+        deadline = time.monotonic() + self.SHUTDOWN_TIMEOUT
+        for name, thread in threads.items():
+            thread.join(timeout=max(0.0, deadline - time.monotonic()))
             if thread.is_alive():
-                logger.debug(f"Waiting for thread {thread.name} to complete")
-                thread.join(timeout=2.0)
-                if thread.is_alive():
-                    logger.warning(f"Thread {thread.name} did not complete within timeout")
-        
-        # Clean up audio resources
-        logger.info("Step 4: Cleaning up audio resources")
-        if self.audio_recorder and self.audio_recorder.is_recording:
-            try:
-                self.audio_recorder.stop_recording()
-                logger.info("Step 4: Audio resources cleaned up")
-            except Exception as e:
-                logger.error(f"Step 4: Error cleaning up audio resources: {e}", exc_info=True)
+                logger.warning(f"Shutdown: {name} did not stop within {self.SHUTDOWN_TIMEOUT}s")
+                steps.append((name, "timeout"))
+            elif name in errors:
+                logger.error(f"Shutdown: error stopping {name}: {errors[name]}", exc_info=errors[name])
+                steps.append((name, "error"))
+            else:
+                steps.append((name, "ok"))
         
-        logger.info("Step 5: Application shutdown complete")
-        logger.info("=" * 60)
+        # Drop pool tasks that haven't started yet and give running ones (e.g. an
+        # in-flight process_audio) whatever is left of the shared deadline
+        logger.debug("Step 3: Shutting down worker pool")
+        with self._pool_futures_lock:
+            pending = set(self._pool_futures)
+        running = {future for future in pending if not future.cancel()}
+        _, not_done = wait(running, timeout=max(0.0, deadline - time.monotonic()))
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        if not_done:
+            logger.warning(f"Shutdown: {len(not_done)} worker pool task(s) did not finish within {self.SHUTDOWN_TIMEOUT}s")
+            steps.append(("worker_pool", "timeout"))
+        else:
+            steps.append(("worker_pool", "ok"))
+        
+        logger.info("shutdown summary: %s", steps)
         
         # Quit
         rumps.quit_application()
@@ -797,6 +1095,46 @@ def main():
         sys.exit(1)
 
 
+def run_server(host: str, port: int):
+    """Run the HTTP/WebSocket server on an explicitly managed event loop.
+    
+    Uses uvloop (when available) and the httptools HTTP parser from uvicorn[standard].
+    Set LOCALFLOW_PROFILE_LOOP=1 to log every event loop callback that blocks
+    longer than LOOP_BLOCKING_THRESHOLD.
+    
+    Args:
+        host: Interface to bind
+        port: Port to listen on
+    """
+    import asyncio
+    
+    import uvicorn
+    from server import app
+    
+    loop_factory = None
+    if sys.platform != "win32":
+        try:
+            import uvloop
+            loop_factory = uvloop.new_event_loop
+        except ImportError:
+            logger.info("uvloop not available, using the default asyncio event loop")
+    
+    profile_loop = os.environ.get("LOCALFLOW_PROFILE_LOOP") == "1"
+    
+    server_config = uvicorn.Config(app, host=host, port=port, http="httptools")
+    server = uvicorn.Server(server_config)
+    
+    async def serve():
+        if profile_loop:
+            # In debug mode asyncio logs "Executing <callback> took N seconds"
+            # for every callback exceeding slow_callback_duration
+            asyncio.get_running_loop().slow_callback_duration = LOOP_BLOCKING_THRESHOLD
+            logger.info(f"Event loop blocking monitor enabled (threshold {LOOP_BLOCKING_THRESHOLD * 1000:.0f}ms)")
+        await server.serve()
+    
+    asyncio.run(serve(), debug=profile_loop, loop_factory=loop_factory)
+
+
 if __name__ == "__main__":
     import argparse
     
@@ -823,23 +1161,14 @@ if __name__ == "__main__":
     
     if args.server:
         # Run as server
-        import uvicorn
-        from server import app
-        
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S',
-            stream=sys.stdout,
-            force=True
-        )
+        _configure_logging()
         
-        logger.info("=" * 60)
+        logger.info(_BANNER)
         logger.info("Starting LocalFlow Server Mode")
         logger.info(f"Server will be available at http://{args.host}:{args.port}")
-        logger.info("=" * 60)
+        logger.info(_BANNER)
         
-        uvicorn.run(app, host=args.host, port=args.port)
+        run_server(args.host, args.port)
     else:
         # Run as CLI app (original behavior)
         main()
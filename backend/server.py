@@ -34,11 +34,19 @@ audio_recorder: Optional[AudioRecorder] = None
 transcriber: Optional[WhisperTranscriber] = None
 injector: Optional[TextInjector] = None
 vad: Optional[SileroVAD] = None
+decode_options: dict = dict(config.DEFAULT_DECODE_OPTIONS)
 is_recording = False
 active_websockets = set()
 waveform_update_task: Optional[asyncio.Task] = None
 event_loop: Optional[asyncio.AbstractEventLoop] = None
 
+# Waveform streaming frame pacing (seconds)
+WAVEFORM_FRAME_INTERVAL = 0.05  # ~20 FPS
+WAVEFORM_MIN_DELAY = 0.016  # Never reschedule sooner than one 60 Hz frame
+WAVEFORM_SLOW_FRAME = 0.1  # A frame slower than this skips the next one
+WAVEFORM_IDLE_INTERVAL = 0.25  # Heartbeat while no client is connected
+DOWNLOAD_PROGRESS_INTERVAL = 0.1  # Minimum seconds between download progress broadcasts
+
 
 # Pydantic models for request/response
 class HotkeyConfig(BaseModel):
@@ -64,12 +72,13 @@ class ModelDownloadRequest(BaseModel):
 
 def initialize_components():
     """Initialize engine components."""
-    global audio_recorder, transcriber, injector, vad
+    global audio_recorder, transcriber, injector, vad, decode_options
     
     logger.info("Initializing LocalFlow components")
     
     # Load configuration
     cfg = config.load_config()
+    decode_options = cfg.get("decode_options", config.DEFAULT_DECODE_OPTIONS)
     
     # Initialize components
     audio_recorder = AudioRecorder()
@@ -94,6 +103,13 @@ def initialize_components():
 
 def _extract_model_variant(model_name: str) -> Optional[str]:
     """Extract model variant from full model name."""
+    # Exact repo ids and variant names resolve with a dict lookup
+    variant = WhisperTranscriber.REPO_TO_VARIANT.get(model_name)
+    if variant is not None:
+        return variant
+    if model_name in WhisperTranscriber.MODEL_VARIANTS:
+        return model_name
+    
     model_lower = model_name.lower()
     
     if "large-v3-turbo" in model_lower or "large-turbo" in model_lower:
@@ -209,7 +225,7 @@ async def stop_recording():
                     if injector and text:
                         injector.inject_text(text)
                 
-                transcriber.transcribe_async(audio_to_transcribe, on_complete)
+                transcriber.transcribe_async(audio_to_transcribe, on_complete, **decode_options)
             except Exception as e:
                 logger.error(f"Error processing audio: {e}", exc_info=True)
                 if event_loop:
@@ -240,7 +256,7 @@ async def update_config(config_update: ConfigUpdate):
         
         if config_update.hotkey:
             current_config["hotkey"] = {
-                "modifiers": config_update.hotkey.modifiers,
+                "modifiers": config.canonical_modifiers(config_update.hotkey.modifiers),
                 "key": config_update.hotkey.key
             }
         
@@ -295,7 +311,21 @@ async def download_model(request: ModelDownloadRequest):
         return {"success": False, "error": "Transcriber not initialized"}
     
     try:
+        last_pct = -1
+        last_ts = 0.0
+        
         def progress_callback(progress: float):
+            nonlocal last_pct, last_ts
+            # Throttle to whole-percent changes at most every DOWNLOAD_PROGRESS_INTERVAL;
+            # completion and error (negative) updates are always sent
+            pct = int(progress * 100)
+            now = time.monotonic()
+            final = progress >= 1.0 or progress < 0
+            if not final and (pct == last_pct or now - last_ts < DOWNLOAD_PROGRESS_INTERVAL):
+                return
+            last_pct = pct
+            last_ts = now
+            
             # Broadcast progress to WebSocket clients
             if event_loop:
                 asyncio.run_coroutine_threadsafe(
@@ -307,7 +337,8 @@ async def download_model(request: ModelDownloadRequest):
                     event_loop
                 )
         
-        success = transcriber.download_model(request.variant, progress_callback)
+        # Run off the event loop so progress broadcasts are delivered while downloading
+        success = await asyncio.to_thread(transcriber.download_model, request.variant, progress_callback)
         
         if success:
             return {"success": True, "variant": request.variant}
@@ -325,7 +356,8 @@ async def switch_model(request: ModelSwitchRequest):
         return {"success": False, "error": "Transcriber not initialized"}
     
     try:
-        if transcriber.load_model(request.variant):
+        # Loading a multi-GB model takes seconds; keep the event loop responsive meanwhile
+        if await asyncio.to_thread(transcriber.load_model, request.variant):
             # Update config
             current_config = config.load_config()
             repo_id = transcriber.MODEL_VARIANTS.get(request.variant)
@@ -385,17 +417,41 @@ def _start_waveform_updates():
         return
     
     async def update_loop():
+        skip_next = False
+        last_generation = None
         while is_recording and audio_recorder:
             try:
+                if skip_next:
+                    # Previous frame overran; drop this one so slow sends don't pile up
+                    skip_next = False
+                    await asyncio.sleep(WAVEFORM_FRAME_INTERVAL)
+                    continue
+                
+                if not active_websockets:
+                    # Nobody is watching; skip sampling and re-check slowly
+                    await asyncio.sleep(WAVEFORM_IDLE_INTERVAL)
+                    continue
+                
+                generation = audio_recorder.waveform_generation
+                if generation == last_generation:
+                    # No new audio since the last frame; nothing to send
+                    await asyncio.sleep(WAVEFORM_FRAME_INTERVAL)
+                    continue
+                last_generation = generation
+                
+                frame_start = time.perf_counter()
                 waveform_data = audio_recorder.get_waveform_data()
                 if waveform_data:
-                    # Convert to list of floats (JSON serializable)
-                    waveform_list = [float(x) for x in waveform_data]
+                    # Amplitudes are already Python floats (JSON serializable)
                     await _broadcast_message({
                         "type": "waveform",
-                        "data": waveform_list
+                        "data": waveform_data
                     })
-                await asyncio.sleep(0.05)  # ~20 FPS
+                
+                # Subtract this frame's cost from the interval to hold ~20 FPS
+                elapsed = time.perf_counter() - frame_start
+                skip_next = elapsed > WAVEFORM_SLOW_FRAME
+                await asyncio.sleep(max(WAVEFORM_MIN_DELAY, WAVEFORM_FRAME_INTERVAL - elapsed))
             except Exception as e:
                 logger.error(f"Error in waveform update loop: {e}")
                 break